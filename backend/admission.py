@@ -0,0 +1,95 @@
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, Request
+
+def too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=429, detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+class ConcurrencyLimiter:
+    """Caps concurrent work on a route and bounds how many callers may wait for a slot."""
+
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait: float, retry_after: int = 5):
+        if limit < 1 or max_queue < 0 or max_wait <= 0:
+            raise ValueError(f"{name} limiter needs limit >= 1, max_queue >= 0 and max_wait > 0 "
+                             f"(got limit={limit}, max_queue={max_queue}, max_wait={max_wait})")
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.active + self.waiting >= self.limit + self.max_queue:
+            self.rejected += 1
+            raise too_many_requests(f"Too many concurrent {self.name} requests", self.retry_after)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise too_many_requests(f"Timed out waiting for a {self.name} slot", self.retry_after)
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {"limit": self.limit, "active": self.active, "waiting": self.waiting,
+                "max_queue": self.max_queue, "rejected": self.rejected}
+
+class RateLimiter:
+    """In-process token bucket per client; the least recently seen clients are evicted."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        if rate <= 0 or burst < 1 or max_clients < 1:
+            raise ValueError(f"Rate limiter needs rate > 0, burst >= 1 and max_clients >= 1 "
+                             f"(got rate={rate}, burst={burst}, max_clients={max_clients})")
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> float:
+        """Take one token for `key`; returns 0 when allowed, else seconds until a token frees up."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+def client_key(request: Request) -> str:
+    # Keyed by IP: the API issues no keys, so a client-supplied key header can't be trusted
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+def rate_limit(limiter: RateLimiter):
+    def dependency(request: Request):
+        wait = limiter.acquire(client_key(request))
+        if wait:
+            raise too_many_requests("Rate limit exceeded", wait)
+    return dependency
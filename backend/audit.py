@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime
+
+from typing import NamedTuple, Optional
+
+from fastapi import Header, Request
+from fastapi.concurrency import run_in_threadpool
+
+import queries
+from database import db_connection
+
+logger = logging.getLogger(__name__)
+
+# Column order of a buffered event, matching queries.INSERT_QUOTE_EVENT
+EVENT_FIELDS = ("quote_id", "action", "status", "actor", "actor_hint", "created_at")
+ACTOR_HINT_MAX_LENGTH = 255
+
+class Actor(NamedTuple):
+    ip: str
+    hint: Optional[str] = None
+
+class AuditLog:
+    """Write-behind buffer of quote events, flushed to quote_events in batches.
+
+    Handlers only append to memory; a background task writes a batch whenever
+    `flush_size` events are waiting or every `flush_interval` seconds, and the
+    app lifespan flushes whatever is left on shutdown.
+    """
+
+    def __init__(self, flush_size: int, flush_interval: float, max_buffer: int = 10000):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wake = asyncio.Event()
+        self._task = None
+        self._loop = None
+        self._stopping = False
+        self.dropped = 0
+
+    def record(self, quote_id: str, action: str, status: str = None, actor: Actor = None):
+        actor = actor or Actor(None)
+        event = (quote_id, action, status, actor.ip, actor.hint, datetime.utcnow())
+        with self._lock:
+            self._buffer.append(event)
+            if len(self._buffer) > self.max_buffer:
+                # The database has been unreachable for a while; keep the newest events
+                del self._buffer[0]
+                self.dropped += 1
+            full = len(self._buffer) >= self.flush_size
+        if full and self._loop:
+            # Handlers run in threadpool threads; asyncio.Event is only safe to set from its loop
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def pending_for(self, quote_id: str) -> list:
+        with self._lock:
+            return [event for event in self._buffer if event[0] == quote_id]
+
+    def flush(self, pool) -> int:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        try:
+            with db_connection(pool) as db:
+                cursor = db.cursor()
+                cursor.executemany(queries.INSERT_QUOTE_EVENT, batch)
+                db.commit()
+                cursor.close()
+        except Exception as e:
+            logger.error(f"Audit flush of {len(batch)} events failed: {e}")
+            with self._lock:
+                self._buffer[:0] = batch
+                overflow = len(self._buffer) - self.max_buffer
+                if overflow > 0:
+                    del self._buffer[:overflow]
+                    self.dropped += overflow
+            return 0
+        return len(batch)
+
+    async def _run(self, pool):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await run_in_threadpool(self.flush, pool)
+
+    def start(self, pool):
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(self._run(pool))
+
+    async def stop(self, pool):
+        # Let an in-flight flush finish rather than cancelling it, then drain the rest
+        self._stopping = True
+        self._wake.set()
+        if self._task:
+            await self._task
+            self._task = None
+        await run_in_threadpool(self.flush, pool)
+        with self._lock:
+            if self._buffer:
+                logger.error(f"Audit log lost {len(self._buffer)} events at shutdown")
+
+def request_actor(request: Request, x_actor: Optional[str] = Header(None)) -> Actor:
+    """Who made the change: the client IP, plus any X-Actor header as an unverified hint.
+
+    The API has no authentication, so X-Actor is whatever the client chose to send;
+    it is stored separately and never in place of the IP.
+    """
+    hint = x_actor.strip()[:ACTOR_HINT_MAX_LENGTH] if x_actor else None
+    return Actor(request.client.host if request.client else "unknown", hint or None)
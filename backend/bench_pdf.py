@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Compare the shared-style renderer in quote_pdf.py against the original
+per-call implementation: bytes per PDF and render time.
+
+    python bench_pdf.py --renders 200
+"""
+
+import argparse
+import io
+import time
+from datetime import datetime
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+from reportlab.lib import colors
+
+from quote_pdf import generate_quote_pdf
+
+SAMPLE_QUOTE = {
+    "quote_id": "A2DA3B1E", "client_name": "Test Print Co", "product_type": "Brochure",
+    "finished_size": "A4 (210 × 297mm)", "page_count": 8, "sidedness": "double",
+    "cover_stock": "300gsm Gloss Art", "text_stock": "150gsm Gloss Art",
+    "finishing_options": ["Matt Laminate", "Foiling (Other)"], "quantity": 1000,
+    "delivery_location": "Metro Melbourne", "special_requirements": "Deliver before 9am",
+    "ink_type": "CMYK", "pms_colors": True, "pms_color_count": 2, "estimated_cost": 5123.45,
+    "created_at": datetime(2025, 1, 1), "status": "pending",
+}
+
+def legacy_quote_pdf(quote_data):
+    # Pre-refactor renderer: fresh stylesheet per call
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5 * inch)
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=20, alignment=1, textColor=colors.HexColor('#4F46E5'))
+    heading = ParagraphStyle('Heading', parent=styles['Heading2'], fontSize=14, textColor=colors.HexColor('#1F2937'))
+    story = [Paragraph("PRINT QUOTE", title_style), Spacer(1, 20)]
+    story.append(Paragraph("Quote Information", heading))
+    info = [['Quote ID:', quote_data['quote_id']], ['Date:', quote_data['created_at'].strftime('%d/%m/%Y')],
+            ['Client:', quote_data['client_name']], ['Status:', quote_data['status'].title()],
+            ['Estimated Cost:', f"${quote_data['estimated_cost']:.2f}"]]
+    story.append(Table(info, colWidths=[2*inch, 4*inch]))
+    story.append(Spacer(1, 20))
+    story.append(Paragraph("Product Specifications", heading))
+    specs = [['Product Type:', quote_data['product_type']],
+             ['Finished Size:', quote_data['finished_size']],
+             ['Page Count:', str(quote_data['page_count'])],
+             ['Printing:', quote_data['sidedness'].title() + ' Sided'],
+             ['Quantity:', str(quote_data['quantity'])],
+             ['Ink Type:', quote_data['ink_type']]]
+    if quote_data['pms_colors']:
+        specs.append(['PMS Colors:', str(quote_data['pms_color_count'])])
+    if quote_data['cover_stock']:
+        specs.append(['Cover Stock:', quote_data['cover_stock']])
+    if quote_data['text_stock']:
+        specs.append(['Text Stock:', quote_data['text_stock']])
+    story.append(Table(specs, colWidths=[2*inch, 4*inch]))
+    if quote_data['finishing_options']:
+        story.append(Paragraph("Finishing Options", heading))
+        story.append(Paragraph(", ".join(quote_data['finishing_options']), styles['Normal']))
+    story.append(Paragraph("Delivery Location: " + quote_data['delivery_location'], styles['Normal']))
+    if quote_data['special_requirements']:
+        story.append(Paragraph("Special Requirements: " + quote_data['special_requirements'], styles['Normal']))
+    story.append(Spacer(1, 30))
+    story.append(Paragraph("Total Estimated Cost", heading))
+    story.append(Paragraph(f"<b>${quote_data['estimated_cost']:.2f}</b>", styles['Normal']))
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+def measure(render, renders):
+    render(SAMPLE_QUOTE)  # warm-up
+    size = 0
+    started = time.perf_counter()
+    for _ in range(renders):
+        size = len(render(SAMPLE_QUOTE).getvalue())
+    elapsed = time.perf_counter() - started
+    return size, elapsed / renders * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark quote PDF rendering")
+    parser.add_argument("--renders", type=int, default=200)
+    args = parser.parse_args()
+    print(f"{'renderer':<10} {'bytes/pdf':>10} {'ms/pdf':>8}")
+    for name, render in (("legacy", legacy_quote_pdf), ("current", generate_quote_pdf)):
+        size, ms = measure(render, args.renders)
+        print(f"{name:<10} {size:>10} {ms:>8.2f}")
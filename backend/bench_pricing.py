@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Compare a cached unit-cost lookup in pricing.py against recomputing the cost.
+
+    python bench_pricing.py --calls 200000
+"""
+
+import argparse
+import timeit
+
+import pricing
+from models import QuoteRequest
+
+SAMPLE_QUOTE = QuoteRequest(
+    client_name="Test Print Co", product_type="Brochure", finished_size="A4 (210 × 297mm)",
+    page_count=8, sidedness="double", cover_stock="300gsm Gloss Art", text_stock="150gsm Gloss Art",
+    finishing_options=["Matt Laminate", "Foiling (Other)"], quantity=1000,
+    delivery_location="Metro Melbourne", special_requirements=None, ink_type="CMYK",
+    pms_colors=True, pms_color_count=2,
+)
+
+def per_call_us(func, calls):
+    return min(timeit.repeat(func, number=calls, repeat=5)) / calls * 1e6
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark unit-cost caching")
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+    pricing.unit_cost(SAMPLE_QUOTE)
+    cached = per_call_us(lambda: pricing.unit_cost(SAMPLE_QUOTE), args.calls)
+    recompute = per_call_us(lambda: pricing._compute_unit_cost(pricing.spec_key(SAMPLE_QUOTE)), args.calls)
+    print(f"{'path':<10} {'us/call':>8}")
+    print(f"{'cached':<10} {cached:>8.2f}")
+    print(f"{'recompute':<10} {recompute:>8.2f}")
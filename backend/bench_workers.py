@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the multi-worker deployment.
+
+Start the API with a given worker count, then point this at it:
+
+    WEB_CONCURRENCY=1 gunicorn -c gunicorn.conf.py server:app
+    python bench_workers.py http://localhost:8001 --path /api/quotes/ABCD1234
+
+Export routes are rate-limited per IP and capped per worker, so lift those limits
+(see DEPLOYMENT.md) before benchmarking /export. Only successful responses count
+towards throughput; errors are reported separately.
+"""
+
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+def run(base_url, path, total, concurrency):
+    url = base_url.rstrip("/") + path
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def hit(_):
+        start = time.perf_counter()
+        response = session.get(url, timeout=60)
+        return response.status_code, time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(hit, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for status, latency in results if status < 400)
+    errors = Counter(status for status, _ in results if status >= 400)
+    print(f"URL:          {url}")
+    print(f"Requests:     {total} at concurrency {concurrency}, {len(latencies)} succeeded")
+    print(f"Throughput:   {len(latencies) / elapsed:.1f} successful req/s")
+    if errors:
+        print(f"Errors:       {sum(errors.values())} ({', '.join(f'{n}x {code}' for code, n in sorted(errors.items()))})")
+        if 429 in errors:
+            print("              429s mean admission control is throttling the run; see DEPLOYMENT.md")
+    if latencies:
+        print(f"Latency p50:  {latencies[len(latencies) // 2] * 1000:.1f} ms")
+        print(f"Latency p99:  {latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark API throughput")
+    parser.add_argument("base_url")
+    parser.add_argument("--path", default="/api/quotes")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    run(args.base_url, args.path, args.requests, args.concurrency)
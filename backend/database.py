@@ -0,0 +1,57 @@
+import os
+import threading
+from contextlib import contextmanager
+import mysql.connector
+from mysql.connector import pooling
+from fastapi import HTTPException, Request
+
+DB_CONFIG = {
+    "host": os.getenv("MYSQL_HOST"),
+    "user": os.getenv("MYSQL_USER"),
+    "password": os.getenv("MYSQL_PASSWORD"),
+    "database": os.getenv("MYSQL_DATABASE"),
+    # Pooled connections are reset on release, which fails if a result was left half-read
+    "consume_results": True,
+}
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+
+def connect(**overrides):
+    return mysql.connector.connect(**{**DB_CONFIG, **overrides})
+
+class ConnectionPool:
+    """MySQL pool whose callers wait up to `timeout` seconds for a free connection.
+
+    MySQLConnectionPool.get_connection() raises as soon as the pool is empty, so a
+    semaphore sized to the pool queues callers and only a timed-out wait is an error.
+    """
+
+    def __init__(self, size: int, timeout: float, **config):
+        self.size = size
+        self.timeout = timeout
+        self._pool = pooling.MySQLConnectionPool(pool_name=f"quotes-{os.getpid()}", pool_size=size, **config)
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HTTPException(status_code=503, detail="Database busy", headers={"Retry-After": "1"})
+        try:
+            db = self._pool.get_connection()
+            try:
+                yield db
+            finally:
+                db.close()
+        finally:
+            self._slots.release()
+
+def create_pool():
+    return ConnectionPool(DB_POOL_SIZE, DB_POOL_TIMEOUT, **DB_CONFIG)
+
+def db_connection(pool):
+    """Blocking: call from a threadpool thread (plain `def` handlers), not the event loop."""
+    return pool.connection()
+
+def get_db(request: Request):
+    with db_connection(request.app.state.db_pool) as db:
+        yield db
@@ -0,0 +1,16 @@
+import multiprocessing
+import os
+
+# Multi-worker deployment: every worker imports the app on its own and opens its
+# own DB pool in the lifespan handler, so the app must not be preloaded.
+bind = f"0.0.0.0:{os.getenv('PORT', '8001')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = False
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = 30
+accesslog = "-"
+# Proxies whose X-Forwarded-For / X-Forwarded-Proto are trusted (UvicornWorker passes this on).
+# Behind a load balancer such as Render's, every request comes from the proxy, so without
+# this the per-IP rate limits and audit actors would all see the proxy's address.
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1,::1")
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for the quotes database.
+
+    python migrations.py status     # show applied / pending versions
+    python migrations.py upgrade    # apply pending migrations
+
+Deploys run `upgrade` before starting the API. The API only reads the schema
+version on startup and refuses to serve an outdated database unless
+AUTO_MIGRATE=1, in which case it upgrades first.
+"""
+
+import argparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_LOCK = "impactai_schema_migrations"
+
+def _index_exists(cursor, table, index):
+    cursor.execute(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+        (table, index),
+    )
+    return cursor.fetchone() is not None
+
+def _create_index(cursor, table, index, columns):
+    # MySQL has no CREATE INDEX IF NOT EXISTS; databases created before migrations may already have some
+    if not _index_exists(cursor, table, index):
+        cursor.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+
+def _drop_index(cursor, table, index):
+    if _index_exists(cursor, table, index):
+        cursor.execute(f"DROP INDEX {index} ON {table}")
+
+def _0001_create_quotes(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS quotes (
+            quote_id VARCHAR(16) NOT NULL,
+            client_name VARCHAR(255) NOT NULL,
+            product_type VARCHAR(100) NOT NULL,
+            finished_size VARCHAR(100) NOT NULL,
+            page_count INT NOT NULL,
+            sidedness VARCHAR(20) NOT NULL,
+            cover_stock VARCHAR(255) NULL,
+            text_stock VARCHAR(255) NULL,
+            finishing_options TEXT NULL,
+            quantity INT NOT NULL,
+            delivery_location VARCHAR(100) NOT NULL,
+            special_requirements TEXT NULL,
+            ink_type VARCHAR(50) NOT NULL,
+            pms_colors BOOLEAN NOT NULL DEFAULT FALSE,
+            pms_color_count INT NOT NULL DEFAULT 1,
+            estimated_cost DECIMAL(12, 2) NOT NULL,
+            created_at DATETIME NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            PRIMARY KEY (quote_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+def _0002_quote_indexes(cursor):
+    # Covers queries.LIST_QUOTES (InnoDB appends the quote_id primary key to every index)
+    _create_index(cursor, "quotes", "idx_quotes_created_listing",
+                  "created_at, client_name, product_type, estimated_cost, status")
+
+def _0003_create_quote_events(cursor):
+    # Append-only audit trail; no foreign key so history outlives deleted quotes
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS quote_events (
+            event_id BIGINT NOT NULL AUTO_INCREMENT,
+            quote_id VARCHAR(16) NOT NULL,
+            action VARCHAR(20) NOT NULL,
+            status VARCHAR(20) NULL,
+            actor VARCHAR(255) NULL,
+            created_at DATETIME(6) NOT NULL,
+            PRIMARY KEY (event_id),
+            KEY idx_quote_events_quote_created (quote_id, created_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+def _0004_quote_event_actor_hint(cursor):
+    # actor holds the client IP; the unauthenticated X-Actor header is kept apart as a hint
+    cursor.execute("ALTER TABLE quote_events ADD COLUMN actor_hint VARCHAR(255) NULL AFTER actor")
+
+def _0005_drop_unused_quote_indexes(cursor):
+    # Earlier builds of migration 2 also indexed status and client lookups that no query issues
+    _drop_index(cursor, "quotes", "idx_quotes_status_created")
+    _drop_index(cursor, "quotes", "idx_quotes_client_created")
+
+# (version, description, apply(cursor)); append only, never edit an applied migration
+MIGRATIONS = [
+    (1, "create quotes table", _0001_create_quotes),
+    (2, "index quotes for listing", _0002_quote_indexes),
+    (3, "create quote_events audit table", _0003_create_quote_events),
+    (4, "add unverified actor_hint to quote_events", _0004_quote_event_actor_hint),
+    (5, "drop quote indexes no query uses", _0005_drop_unused_quote_indexes),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def _ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT NOT NULL PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB
+    """)
+
+def _version_table_exists(cursor):
+    cursor.execute(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name = 'schema_migrations' LIMIT 1"
+    )
+    return cursor.fetchone() is not None
+
+def current_version(db) -> int:
+    """Applied schema version; read-only, so a database predating migrations is version 0."""
+    cursor = db.cursor(buffered=True)
+    try:
+        if not _version_table_exists(cursor):
+            return 0
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+def upgrade(db, target: int = LATEST_VERSION) -> list:
+    """Apply pending migrations up to `target`; returns the versions applied."""
+    cursor = db.cursor(buffered=True)
+    # Serialize concurrent upgrades, e.g. several workers starting with AUTO_MIGRATE=1
+    cursor.execute("SELECT GET_LOCK(%s, 60)", (MIGRATION_LOCK,))
+    if cursor.fetchone()[0] != 1:
+        raise RuntimeError("Timed out waiting for the schema migration lock")
+    applied = []
+    try:
+        _ensure_version_table(cursor)
+        version = current_version(db)
+        for number, description, apply in MIGRATIONS:
+            if version < number <= target:
+                logger.info(f"Applying migration {number}: {description}")
+                apply(cursor)
+                cursor.execute("INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                               (number, description))
+                db.commit()
+                applied.append(number)
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+        cursor.fetchone()
+        cursor.close()
+    return applied
+
+def check_schema(db, auto_migrate: bool = False):
+    """Startup check: upgrade or fail if the database is behind the code.
+
+    Without auto_migrate this only reads, so the API's database user needs no DDL rights.
+    """
+    version = current_version(db)
+    if version == LATEST_VERSION:
+        return
+    if version > LATEST_VERSION:
+        raise RuntimeError(f"Database schema version {version} is newer than this code ({LATEST_VERSION})")
+    if not auto_migrate:
+        raise RuntimeError(f"Database schema is at version {version}, expected {LATEST_VERSION}; "
+                           "run `python migrations.py upgrade` or set AUTO_MIGRATE=1")
+    upgrade(db)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the quotes database schema")
+    parser.add_argument("command", choices=["status", "upgrade"])
+    parser.add_argument("--target", type=int, default=LATEST_VERSION, help="upgrade only up to this version")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    from database import connect
+
+    db = connect()
+    try:
+        if args.command == "status":
+            version = current_version(db)
+            for number, description, _ in MIGRATIONS:
+                state = "applied" if number <= version else "pending"
+                print(f"{number:>4}  {state:<8} {description}")
+        else:
+            applied = upgrade(db, args.target)
+            print(f"Applied {len(applied)} migration(s); schema at version {current_version(db)}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
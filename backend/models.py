@@ -0,0 +1,64 @@
+import os
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+
+MAX_COMPARE_QUOTES = int(os.getenv("MAX_COMPARE_QUOTES", "50"))
+
+class QuoteRequest(BaseModel):
+    client_name: str = Field(..., min_length=1)
+    product_type: str
+    finished_size: str
+    page_count: int
+    sidedness: str
+    cover_stock: Optional[str]
+    text_stock: Optional[str]
+    finishing_options: List[str] = []
+    quantity: int
+    delivery_location: str
+    special_requirements: Optional[str]
+    ink_type: str
+    pms_colors: bool = False
+    pms_color_count: int = 1
+
+class CompareRequest(BaseModel):
+    quote_ids: List[str] = Field(..., max_length=MAX_COMPARE_QUOTES)
+
+    @field_validator("quote_ids")
+    @classmethod
+    def distinct_quote_ids(cls, quote_ids):
+        # Dedupe first so ["A", "A"] can't pass as a two-quote comparison
+        quote_ids = list(dict.fromkeys(quote_ids))
+        if len(quote_ids) < 2:
+            raise ValueError("at least 2 distinct quote IDs are required")
+        return quote_ids
+
+class QuoteResponse(BaseModel):
+    quote_id: str
+    client_name: str
+    product_type: str
+    estimated_cost: float
+    created_at: datetime
+    status: str
+
+class QuoteDetail(QuoteResponse):
+    finished_size: str
+    page_count: int
+    sidedness: str
+    cover_stock: Optional[str]
+    text_stock: Optional[str]
+    finishing_options: List[str]
+    quantity: int
+    delivery_location: str
+    special_requirements: Optional[str]
+    ink_type: str
+    pms_colors: bool
+    pms_color_count: int
+
+class QuoteEvent(BaseModel):
+    quote_id: str
+    action: str
+    status: Optional[str]
+    actor: Optional[str]
+    actor_hint: Optional[str]
+    created_at: datetime
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Price a spreadsheet of product specs offline with the same rules as the API.
+
+    python price_sheet.py specs.xlsx -o priced.csv --workers 4
+
+Columns are named after QuoteRequest fields (client_name, product_type, ...).
+finishing_options may list several finishes separated by ";" or ",". The output
+CSV repeats the input columns and adds estimated_cost plus an error column
+holding any validation failure for that row. Legacy .xls workbooks are not
+read; save them as .xlsx or CSV first.
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+from typing import get_args
+
+import pandas as pd
+from pydantic import ValidationError
+
+from models import QuoteRequest
+from pricing import calculate_quote_cost
+
+OUTPUT_COLUMNS = ["estimated_cost", "error"]
+
+# Required fields that accept None, so an empty cell means "none" rather than "missing"
+NULLABLE_FIELDS = {name for name, field in QuoteRequest.model_fields.items()
+                   if field.is_required() and type(None) in get_args(field.annotation)}
+
+def _quote_request(record: dict) -> QuoteRequest:
+    data = {}
+    for name in QuoteRequest.model_fields:
+        value = record.get(name, "")
+        value = value.strip() if isinstance(value, str) else value
+        if value == "" or value is None:
+            if name in NULLABLE_FIELDS:
+                data[name] = None
+            continue
+        if name == "finishing_options":
+            value = [f.strip() for f in re.split(r"[;,]", value) if f.strip()]
+        data[name] = value
+    return QuoteRequest(**data)
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors())
+
+def price_records(records: list) -> list:
+    """Price one batch of rows; returns (estimated_cost, error) per row, in order."""
+    results = []
+    for record in records:
+        try:
+            results.append((calculate_quote_cost(_quote_request(record)), ""))
+        except ValidationError as e:
+            results.append(("", _validation_message(e)))
+    return results
+
+def read_sheet(path: str, batch_size: int):
+    """Return (columns, batches of row dicts); CSV is streamed, Excel is read once and sliced.
+
+    Raises ValueError for inputs that can't be priced: .xls, no header row, or
+    columns that would collide with the ones this tool adds.
+    """
+    if path.lower().endswith(".xls"):
+        raise ValueError(f"{path}: .xls is not supported; save it as .xlsx or CSV")
+    try:
+        if path.lower().endswith(".xlsx"):
+            frame = pd.read_excel(path, dtype=str, keep_default_na=False)
+            columns = list(frame.columns)
+            frames = (frame.iloc[i:i + batch_size] for i in range(0, len(frame), batch_size))
+        else:
+            # Header only, so the output gets its columns even when there are no rows
+            columns = list(pd.read_csv(path, dtype=str, nrows=0).columns)
+            frames = pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=batch_size)
+    except pd.errors.EmptyDataError:
+        columns = []
+    if not columns:
+        raise ValueError(f"{path} is empty; expected a header row of QuoteRequest field names")
+    clashes = [name for name in OUTPUT_COLUMNS if name in columns]
+    if clashes:
+        raise ValueError(f"{path} already has {', '.join(clashes)} column(s); rename or remove them")
+    return columns, (frame.to_dict("records") for frame in frames)
+
+def zip_batches(batches, pool, window: int):
+    """Pair each batch with its results, in input order, pricing them in the worker pool.
+
+    At most `window` batches are read ahead of the writer, so memory stays bounded
+    however large the input is and however slow the output.
+    """
+    in_flight = deque()
+    for records in batches:
+        in_flight.append((records, pool.apply_async(price_records, (records,))))
+        if len(in_flight) >= window:
+            records, result = in_flight.popleft()
+            yield records, result.get()
+    while in_flight:
+        records, result = in_flight.popleft()
+        yield records, result.get()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Price a CSV/Excel sheet of quote specs")
+    parser.add_argument("input", help="CSV or XLSX file")
+    parser.add_argument("-o", "--output", required=True, help="CSV file to write")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="pricing processes")
+    parser.add_argument("--batch-size", type=int, default=2000, help="rows per batch")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    total = errors = 0
+    try:
+        columns, batches = read_sheet(args.input, args.batch_size)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    with open(args.output, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=columns + OUTPUT_COLUMNS)
+        writer.writeheader()
+        pool = Pool(args.workers) if args.workers > 1 else None
+        try:
+            if pool:
+                # Two batches per worker keeps every worker busy while the writer catches up
+                pairs = zip_batches(batches, pool, window=2 * args.workers)
+            else:
+                pairs = ((records, price_records(records)) for records in batches)
+            for records, results in pairs:
+                for record, (cost, error) in zip(records, results):
+                    writer.writerow({**record, "estimated_cost": cost, "error": error})
+                    errors += bool(error)
+                total += len(records)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed else 0.0
+    print(f"Priced {total - errors} of {total} rows ({errors} invalid) in {elapsed:.2f}s "
+          f"- {rate:,.0f} rows/s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
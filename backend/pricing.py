@@ -0,0 +1,122 @@
+import functools
+import math
+import os
+
+# Rate tables
+RATE_TABLES = {
+    'base_cost': {
+        'Booklet': 2.5, 'Brochure': 1.8, 'Flyer': 0.5, 'Signage': 15,
+        'Business Cards': 0.25, 'Posters': 8, 'Banners': 25,
+        'Stickers': 1.2, 'Catalogues': 3.5, 'Newsletters': 1.6
+    },
+    'size_mult': {
+        'A6': 0.8, 'A5': 1.0, 'A4': 1.2, 'A3': 1.8, 'DL': 0.9, 'Custom': 1.5
+    },
+    'finish_cost': {
+        'Matt Laminate': 0.4, 'Gloss Laminate': 0.4, 'Spot UV': 0.8,
+        'Foiling (Gold)': 1.2, 'Foiling (Silver)': 1.0, 'Foiling (Other)': 1.3,
+        'Embossing': 1.5, 'Debossing': 1.5, 'Die Cutting': 2.0,
+        'Perfect Binding': 1.8, 'Saddle Stitching': 0.6
+    },
+    'ink_cost': {'CMYK': 0.15, 'Black Only': 0.05, 'Custom': 0.25},
+    'delivery_cost': {
+        'Metro Melbourne': 15, 'Regional Victoria': 25, 'Interstate (NSW)': 35,
+        'Interstate (QLD)': 40, 'Interstate (SA)': 35, 'Interstate (WA)': 50,
+        'Interstate (TAS)': 45, 'Interstate (NT)': 55, 'Interstate (ACT)': 30
+    },
+}
+
+class UnitCostCache:
+    """Bounded LRU of quantity-independent unit costs keyed by spec tuple.
+
+    Backed by functools.lru_cache so a hit (hash the tuple, C-level lookup) is
+    cheaper than recomputing the cost; it is also thread-safe.
+    """
+
+    def __init__(self, compute, maxsize: int):
+        self.maxsize = maxsize
+        self._cached = functools.lru_cache(maxsize=maxsize)(compute)
+
+    def __call__(self, key):
+        return self._cached(key)
+
+    def clear(self):
+        self._cached.cache_clear()
+
+    def stats(self) -> dict:
+        info = self._cached.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "size": info.currsize,
+            "maxsize": self.maxsize,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_ratio": round(info.hits / lookups, 4) if lookups else 0.0,
+        }
+
+# Bumped on every rate table change so keys built under old rates can never match
+_rates_version = 0
+
+def update_rate_tables(**tables):
+    """Replace one or more rate tables and drop every memoized unit cost."""
+    global _rates_version
+    unknown = set(tables) - set(RATE_TABLES)
+    if unknown:
+        raise KeyError(f"Unknown rate tables: {', '.join(sorted(unknown))}")
+    RATE_TABLES.update(tables)
+    _rates_version += 1
+    unit_cost_cache.clear()
+
+def spec_key(quote_data) -> tuple:
+    """Canonical, hashable key of every field that affects the unit cost."""
+    finishes = quote_data.finishing_options
+    return (
+        _rates_version,
+        quote_data.product_type,
+        quote_data.finished_size.partition(' ')[0],
+        quote_data.page_count,
+        quote_data.sidedness,
+        quote_data.cover_stock,
+        quote_data.text_stock,
+        tuple(sorted(finishes)) if len(finishes) > 1 else tuple(finishes),
+        quote_data.ink_type,
+        quote_data.pms_color_count if quote_data.pms_colors else 0,
+    )
+
+def _compute_unit_cost(spec: tuple) -> float:
+    _, product_type, size, page_count, sidedness, cover_stock, text_stock, finishes, ink_type, pms_count = spec
+    base_cost = RATE_TABLES['base_cost'].get(product_type, 2.0)
+    size_mult = RATE_TABLES['size_mult'].get(size, 1.0)
+    page_mult = max(1.0, page_count * 0.3)
+    sided_mult = 1.6 if sidedness == 'double' else 1.0
+    stock_cost = 0.0
+    if cover_stock:
+        if '300gsm' in cover_stock or '350gsm' in cover_stock:
+            stock_cost += 0.3
+        elif '400gsm' in cover_stock:
+            stock_cost += 0.5
+    if text_stock:
+        if '150gsm' in text_stock or '170gsm' in text_stock:
+            stock_cost += 0.2
+        elif '200gsm' in text_stock or '250gsm' in text_stock:
+            stock_cost += 0.35
+    # The key sorts finishes, so sum them order-independently: fsum is exactly rounded, where a
+    # plain sum could differ in the last bit, and so by a cent, depending on the order given
+    finish_cost = math.fsum(RATE_TABLES['finish_cost'].get(f, 0.0) for f in finishes)
+    ink_cost = RATE_TABLES['ink_cost'].get(ink_type, 0.1)
+    pms_cost = pms_count * 0.35
+    return base_cost * size_mult * page_mult * sided_mult + stock_cost + finish_cost + ink_cost + pms_cost
+
+unit_cost_cache = UnitCostCache(_compute_unit_cost, int(os.getenv("PRICING_CACHE_SIZE", "1024")))
+
+def unit_cost(quote_data) -> float:
+    return unit_cost_cache(spec_key(quote_data))
+
+def quantity_discount(quantity: int) -> float:
+    return 0.15 if quantity >= 1000 else 0.1 if quantity >= 500 else 0.05 if quantity >= 100 else 0.0
+
+def calculate_quote_cost(quote_data) -> float:
+    delivery_cost = RATE_TABLES['delivery_cost'].get(quote_data.delivery_location, 30)
+    discount = quantity_discount(quote_data.quantity)
+    total_cost = unit_cost(quote_data) * quote_data.quantity * (1 - discount) + delivery_cost
+    return round(total_cost, 2)
@@ -0,0 +1,40 @@
+# Every statement the API issues against the quotes database. migrations.py indexes for
+# these, and tests/test_query_plans.py EXPLAINs them, so add new SQL here.
+
+INSERT_QUOTE = """
+    INSERT INTO quotes (
+        quote_id, client_name, product_type, finished_size, page_count, sidedness,
+        cover_stock, text_stock, finishing_options, quantity, delivery_location,
+        special_requirements, ink_type, pms_colors, pms_color_count, estimated_cost,
+        created_at, status
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+SELECT_QUOTE = "SELECT * FROM quotes WHERE quote_id = %s"
+
+LIST_QUOTES = """
+    SELECT quote_id, client_name, product_type, estimated_cost, created_at, status
+    FROM quotes ORDER BY created_at DESC
+"""
+
+UPDATE_QUOTE_STATUS = "UPDATE quotes SET status = %s WHERE quote_id = %s"
+
+DELETE_QUOTE = "DELETE FROM quotes WHERE quote_id = %s"
+
+def compare_quotes(count: int) -> str:
+    placeholders = ", ".join(["%s"] * count)
+    return f"SELECT * FROM quotes WHERE quote_id IN ({placeholders}) ORDER BY FIELD(quote_id, {placeholders})"
+
+def existing_quote_ids(count: int) -> str:
+    placeholders = ", ".join(["%s"] * count)
+    return f"SELECT quote_id FROM quotes WHERE quote_id IN ({placeholders})"
+
+INSERT_QUOTE_EVENT = """
+    INSERT INTO quote_events (quote_id, action, status, actor, actor_hint, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+SELECT_QUOTE_HISTORY = """
+    SELECT quote_id, action, status, actor, actor_hint, created_at
+    FROM quote_events WHERE quote_id = %s ORDER BY created_at, event_id
+"""
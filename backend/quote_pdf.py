@@ -0,0 +1,201 @@
+import functools
+import io
+import logging
+import os
+from xml.sax.saxutils import escape
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import inch
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.lib import colors
+
+logger = logging.getLogger(__name__)
+
+# Styles are immutable once built, so every render shares them
+_styles = getSampleStyleSheet()
+STYLES = {
+    'title': ParagraphStyle('Title', parent=_styles['Heading1'], fontSize=20, alignment=1, textColor=colors.HexColor('#4F46E5')),
+    'heading': ParagraphStyle('Heading', parent=_styles['Heading2'], fontSize=14, textColor=colors.HexColor('#1F2937')),
+    'normal': _styles['Normal'],
+    'cell': ParagraphStyle('Cell', parent=_styles['Normal'], fontSize=8, leading=10),
+    'cell_label': ParagraphStyle('CellLabel', parent=_styles['Normal'], fontSize=8, leading=10, fontName='Helvetica-Bold'),
+}
+COMPARE_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#D1D5DB')),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#EEF2FF')),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#EEF2FF')),
+])
+
+# Optional letterhead, drawn once per document as a form XObject and reused on every page
+LETTERHEAD_TEXT = os.getenv("QUOTE_LETTERHEAD", "")
+LETTERHEAD_LOGO_PATH = os.getenv("QUOTE_LOGO_PATH", "")
+LETTERHEAD_FORM = "letterhead"
+LETTERHEAD_HEIGHT = 0.6 * inch
+
+@functools.lru_cache(maxsize=None)
+def _letterhead_logo():
+    """Load the logo on first use; a bad path is logged and the logo skipped, not fatal."""
+    if not LETTERHEAD_LOGO_PATH:
+        return None
+    try:
+        logo = ImageReader(LETTERHEAD_LOGO_PATH)
+        logo.getSize()
+    except Exception:
+        logger.exception("Could not load letterhead logo %r; rendering without it", LETTERHEAD_LOGO_PATH)
+        return None
+    return logo
+
+def has_letterhead() -> bool:
+    return bool(LETTERHEAD_TEXT or _letterhead_logo())
+
+def _draw_letterhead(canv, doc):
+    if not canv.hasForm(LETTERHEAD_FORM):
+        width, height = doc.pagesize
+        top = height - doc.topMargin + 0.1 * inch
+        canv.beginForm(LETTERHEAD_FORM)
+        logo = _letterhead_logo()
+        if logo:
+            logo_w, logo_h = logo.getSize()
+            draw_h = LETTERHEAD_HEIGHT - 0.1 * inch
+            canv.drawImage(logo, doc.leftMargin, top, width=draw_h * logo_w / logo_h, height=draw_h, mask='auto')
+        if LETTERHEAD_TEXT:
+            canv.setFont('Helvetica-Bold', 12)
+            canv.setFillColor(colors.HexColor('#1F2937'))
+            canv.drawRightString(width - doc.rightMargin, top + 0.15 * inch, LETTERHEAD_TEXT)
+        canv.setStrokeColor(colors.HexColor('#4F46E5'))
+        canv.line(doc.leftMargin, top - 0.05 * inch, width - doc.rightMargin, top - 0.05 * inch)
+        canv.endForm()
+    canv.doForm(LETTERHEAD_FORM)
+
+def build_document(buffer, story, pagesize=A4, **kwargs):
+    """Render `story` into `buffer` with the shared letterhead.
+
+    pageCompression=1 is ReportLab's default already; it is pinned here so a
+    site-wide rl_config override can't silently switch it off.
+    """
+    top_margin = 0.5 * inch + (LETTERHEAD_HEIGHT if has_letterhead() else 0)
+    doc = SimpleDocTemplate(buffer, pagesize=pagesize, topMargin=top_margin, pageCompression=1, **kwargs)
+    if has_letterhead():
+        doc.build(story, onFirstPage=_draw_letterhead, onLaterPages=_draw_letterhead)
+    else:
+        doc.build(story)
+    return doc
+
+def generate_quote_pdf(quote_data):
+    buffer = io.BytesIO()
+    title_style, heading, normal = STYLES['title'], STYLES['heading'], STYLES['normal']
+    story = [Paragraph("PRINT QUOTE", title_style), Spacer(1, 20)]
+    story.append(Paragraph("Quote Information", heading))
+    info = [['Quote ID:', quote_data['quote_id']], ['Date:', quote_data['created_at'].strftime('%d/%m/%Y')],
+            ['Client:', quote_data['client_name']], ['Status:', quote_data['status'].title()],
+            ['Estimated Cost:', f"${quote_data['estimated_cost']:.2f}"]]
+    story.append(Table(info, colWidths=[2*inch, 4*inch]))
+    story.append(Spacer(1, 20))
+    story.append(Paragraph("Product Specifications", heading))
+    specs = [['Product Type:', quote_data['product_type']],
+             ['Finished Size:', quote_data['finished_size']],
+             ['Page Count:', str(quote_data['page_count'])],
+             ['Printing:', quote_data['sidedness'].title() + ' Sided'],
+             ['Quantity:', str(quote_data['quantity'])],
+             ['Ink Type:', quote_data['ink_type']]]
+    if quote_data['pms_colors']:
+        specs.append(['PMS Colors:', str(quote_data['pms_color_count'])])
+    if quote_data['cover_stock']:
+        specs.append(['Cover Stock:', quote_data['cover_stock']])
+    if quote_data['text_stock']:
+        specs.append(['Text Stock:', quote_data['text_stock']])
+    story.append(Table(specs, colWidths=[2*inch, 4*inch]))
+    if quote_data['finishing_options']:
+        story.append(Paragraph("Finishing Options", heading))
+        story.append(Paragraph(", ".join(quote_data['finishing_options']), normal))
+    story.append(Paragraph("Delivery Location: " + quote_data['delivery_location'], normal))
+    if quote_data['special_requirements']:
+        story.append(Paragraph("Special Requirements: " + quote_data['special_requirements'], normal))
+    story.append(Spacer(1, 30))
+    story.append(Paragraph("Total Estimated Cost", heading))
+    story.append(Paragraph(f"<b>${quote_data['estimated_cost']:.2f}</b>", normal))
+    build_document(buffer, story)
+    buffer.seek(0)
+    return buffer
+
+class FlowableStream(list):
+    """Story that pulls flowables from an iterator as the document template consumes them.
+
+    SimpleDocTemplate.build() checks len() before every step, so topping the list up
+    there keeps only a couple of flowables alive instead of the whole document.
+    """
+
+    lookahead = 2
+
+    def __init__(self, flowables):
+        super().__init__()
+        self._source = iter(flowables)
+
+    def __len__(self):
+        while super().__len__() < self.lookahead:
+            flowable = next(self._source, None)
+            if flowable is None:
+                break
+            self.append(flowable)
+        return super().__len__()
+
+# (label, cell value) rows of the comparison table
+COMPARE_FIELDS = [
+    ('Quote ID', lambda q: q['quote_id']),
+    ('Client', lambda q: q['client_name']),
+    ('Date', lambda q: q['created_at'].strftime('%d/%m/%Y')),
+    ('Status', lambda q: q['status'].title()),
+    ('Product Type', lambda q: q['product_type']),
+    ('Finished Size', lambda q: q['finished_size']),
+    ('Page Count', lambda q: str(q['page_count'])),
+    ('Printing', lambda q: q['sidedness'].title() + ' Sided'),
+    ('Quantity', lambda q: str(q['quantity'])),
+    ('Ink Type', lambda q: q['ink_type']),
+    ('PMS Colors', lambda q: str(q['pms_color_count']) if q['pms_colors'] else '-'),
+    ('Cover Stock', lambda q: q['cover_stock'] or '-'),
+    ('Text Stock', lambda q: q['text_stock'] or '-'),
+    ('Finishing', lambda q: ", ".join(q['finishing_options']) or '-'),
+    ('Delivery', lambda q: q['delivery_location']),
+    ('Special Requirements', lambda q: q['special_requirements'] or '-'),
+    ('Estimated Cost', lambda q: f"${q['estimated_cost']:.2f}"),
+]
+COMPARE_COLUMNS_PER_TABLE = 5
+COMPARE_LABEL_WIDTH = 1.6 * inch
+# Free-text fields (special requirements is a TEXT column) are cut short in the side-by-side view
+COMPARE_CELL_MAX_CHARS = 300
+COMPARE_TRUNCATED_NOTE = "… (see the quote PDF for the full text)"
+
+def compare_cell_text(text: str) -> str:
+    if len(text) <= COMPARE_CELL_MAX_CHARS:
+        return text
+    return text[:COMPARE_CELL_MAX_CHARS].rstrip() + COMPARE_TRUNCATED_NOTE
+
+def comparison_table(quotes):
+    """One table with a label column plus one column per quote."""
+    data = []
+    for row, (name, value) in enumerate(COMPARE_FIELDS):
+        # The header (quote ID) and total rows are bold
+        cell = STYLES['cell_label'] if row in (0, len(COMPARE_FIELDS) - 1) else STYLES['cell']
+        data.append([Paragraph(name, STYLES['cell_label'])] +
+                    [Paragraph(escape(compare_cell_text(value(q))), cell) for q in quotes])
+    col_width = (landscape(A4)[0] - 2 * inch - COMPARE_LABEL_WIDTH) / COMPARE_COLUMNS_PER_TABLE
+    # splitInRow lets a row that is still taller than a page continue on the next one
+    return Table(data, colWidths=[COMPARE_LABEL_WIDTH] + [col_width] * len(quotes), style=COMPARE_TABLE_STYLE,
+                 repeatRows=1, splitInRow=1)
+
+def comparison_flowables(quote_chunks):
+    yield Paragraph("QUOTE COMPARISON", STYLES['title'])
+    yield Spacer(1, 20)
+    for index, quotes in enumerate(quote_chunks):
+        if index:
+            yield PageBreak()
+        yield comparison_table(quotes)
+
+def generate_comparison_pdf(quote_chunks):
+    """Render quotes side by side; `quote_chunks` yields lists of at most COMPARE_COLUMNS_PER_TABLE quotes."""
+    buffer = io.BytesIO()
+    build_document(buffer, FlowableStream(comparison_flowables(quote_chunks)), pagesize=landscape(A4))
+    buffer.seek(0)
+    return buffer
@@ -1,27 +1,60 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
+from typing import List
 import os
 from datetime import datetime
 import uuid
 import logging
-import mysql.connector
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 import time
-import io
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
+
+# Local modules read their settings at import time
+load_dotenv()
+
+import queries
+from database import DB_POOL_SIZE, create_pool, db_connection, get_db
+from migrations import check_schema
+from pricing import calculate_quote_cost, unit_cost_cache
+from admission import ConcurrencyLimiter, RateLimiter, rate_limit
+from audit import EVENT_FIELDS, Actor, AuditLog, request_actor
+from models import QuoteRequest, CompareRequest, QuoteResponse, QuoteDetail, QuoteEvent
+from quote_pdf import generate_quote_pdf, generate_comparison_pdf, COMPARE_COLUMNS_PER_TABLE
 
 # Setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-app = FastAPI(title="Print Quote Assistant API", version="1.0.0")
+
+# Admission control for expensive endpoints (per worker)
+pdf_limiter = ConcurrencyLimiter(
+    "PDF export",
+    limit=int(os.getenv("PDF_MAX_CONCURRENCY", "2")),
+    max_queue=int(os.getenv("PDF_MAX_QUEUE", "8")),
+    max_wait=float(os.getenv("PDF_MAX_WAIT_SECONDS", "10")),
+)
+export_rate_limiter = RateLimiter(
+    rate=float(os.getenv("EXPORT_RATE_PER_SECOND", "1")),
+    burst=int(os.getenv("EXPORT_RATE_BURST", "5")),
+)
+audit_log = AuditLog(
+    flush_size=int(os.getenv("AUDIT_FLUSH_SIZE", "100")),
+    flush_interval=float(os.getenv("AUDIT_FLUSH_SECONDS", "2")),
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Each worker process builds its own pool; nothing is shared across forks.
+    app.state.db_pool = create_pool()
+    with db_connection(app.state.db_pool) as db:
+        check_schema(db, auto_migrate=os.getenv("AUTO_MIGRATE") == "1")
+    logger.info(f"Worker {os.getpid()} started with DB pool of {DB_POOL_SIZE}")
+    audit_log.start(app.state.db_pool)
+    yield
+    await audit_log.stop(app.state.db_pool)
+
+app = FastAPI(title="Print Quote Assistant API", version="1.0.0", lifespan=lifespan)
 
 ALLOWED_ORIGINS = os.environ.get('ALLOWED_ORIGINS', '*').split(',')
 app.add_middleware(
@@ -32,149 +65,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# DB setup
-load_dotenv()
-db = mysql.connector.connect(
-    host=os.getenv("MYSQL_HOST"),
-    user=os.getenv("MYSQL_USER"),
-    password=os.getenv("MYSQL_PASSWORD"),
-    database=os.getenv("MYSQL_DATABASE")
-)
-cursor = db.cursor(dictionary=True)
-
-# Models
-class QuoteRequest(BaseModel):
-    client_name: str = Field(..., min_length=1)
-    product_type: str
-    finished_size: str
-    page_count: int
-    sidedness: str
-    cover_stock: Optional[str]
-    text_stock: Optional[str]
-    finishing_options: List[str] = []
-    quantity: int
-    delivery_location: str
-    special_requirements: Optional[str]
-    ink_type: str
-    pms_colors: bool = False
-    pms_color_count: int = 1
-
-class QuoteResponse(BaseModel):
-    quote_id: str
-    client_name: str
-    product_type: str
-    estimated_cost: float
-    created_at: datetime
-    status: str
-
-class QuoteDetail(QuoteResponse):
-    finished_size: str
-    page_count: int
-    sidedness: str
-    cover_stock: Optional[str]
-    text_stock: Optional[str]
-    finishing_options: List[str]
-    quantity: int
-    delivery_location: str
-    special_requirements: Optional[str]
-    ink_type: str
-    pms_colors: bool
-    pms_color_count: int
-
-# Quote cost logic
-def calculate_quote_cost(quote_data: QuoteRequest) -> float:
-    base_cost = {
-        'Booklet': 2.5, 'Brochure': 1.8, 'Flyer': 0.5, 'Signage': 15,
-        'Business Cards': 0.25, 'Posters': 8, 'Banners': 25,
-        'Stickers': 1.2, 'Catalogues': 3.5, 'Newsletters': 1.6
-    }.get(quote_data.product_type, 2.0)
-    size_mult = {
-        'A6': 0.8, 'A5': 1.0, 'A4': 1.2, 'A3': 1.8, 'DL': 0.9, 'Custom': 1.5
-    }.get(quote_data.finished_size.split(' ')[0], 1.0)
-    page_mult = max(1.0, quote_data.page_count * 0.3)
-    sided_mult = 1.6 if quote_data.sidedness == 'double' else 1.0
-    stock_cost = 0.0
-    if quote_data.cover_stock:
-        if '300gsm' in quote_data.cover_stock or '350gsm' in quote_data.cover_stock:
-            stock_cost += 0.3
-        elif '400gsm' in quote_data.cover_stock:
-            stock_cost += 0.5
-    if quote_data.text_stock:
-        if '150gsm' in quote_data.text_stock or '170gsm' in quote_data.text_stock:
-            stock_cost += 0.2
-        elif '200gsm' in quote_data.text_stock or '250gsm' in quote_data.text_stock:
-            stock_cost += 0.35
-    finish_cost = sum({
-        'Matt Laminate': 0.4, 'Gloss Laminate': 0.4, 'Spot UV': 0.8,
-        'Foiling (Gold)': 1.2, 'Foiling (Silver)': 1.0, 'Foiling (Other)': 1.3,
-        'Embossing': 1.5, 'Debossing': 1.5, 'Die Cutting': 2.0,
-        'Perfect Binding': 1.8, 'Saddle Stitching': 0.6
-    }.get(f, 0.0) for f in quote_data.finishing_options)
-    ink_cost = {'CMYK': 0.15, 'Black Only': 0.05, 'Custom': 0.25}.get(quote_data.ink_type, 0.1)
-    pms_cost = quote_data.pms_color_count * 0.35 if quote_data.pms_colors else 0
-    delivery_cost = {
-        'Metro Melbourne': 15, 'Regional Victoria': 25, 'Interstate (NSW)': 35,
-        'Interstate (QLD)': 40, 'Interstate (SA)': 35, 'Interstate (WA)': 50,
-        'Interstate (TAS)': 45, 'Interstate (NT)': 55, 'Interstate (ACT)': 30
-    }.get(quote_data.delivery_location, 30)
-    discount = 0.15 if quote_data.quantity >= 1000 else 0.1 if quote_data.quantity >= 500 else 0.05 if quote_data.quantity >= 100 else 0.0
-    unit_cost = base_cost * size_mult * page_mult * sided_mult + stock_cost + finish_cost + ink_cost + pms_cost
-    total_cost = unit_cost * quote_data.quantity * (1 - discount) + delivery_cost
-    return round(total_cost, 2)
-
-def generate_quote_pdf(quote_data):
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5 * inch)
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=20, alignment=1, textColor=colors.HexColor('#4F46E5'))
-    heading = ParagraphStyle('Heading', parent=styles['Heading2'], fontSize=14, textColor=colors.HexColor('#1F2937'))
-    story = [Paragraph("PRINT QUOTE", title_style), Spacer(1, 20)]
-    story.append(Paragraph("Quote Information", heading))
-    info = [['Quote ID:', quote_data['quote_id']], ['Date:', quote_data['created_at'].strftime('%d/%m/%Y')],
-            ['Client:', quote_data['client_name']], ['Status:', quote_data['status'].title()],
-            ['Estimated Cost:', f"${quote_data['estimated_cost']:.2f}"]]
-    story.append(Table(info, colWidths=[2*inch, 4*inch]))
-    story.append(Spacer(1, 20))
-    story.append(Paragraph("Product Specifications", heading))
-    specs = [['Product Type:', quote_data['product_type']],
-             ['Finished Size:', quote_data['finished_size']],
-             ['Page Count:', str(quote_data['page_count'])],
-             ['Printing:', quote_data['sidedness'].title() + ' Sided'],
-             ['Quantity:', str(quote_data['quantity'])],
-             ['Ink Type:', quote_data['ink_type']]]
-    if quote_data['pms_colors']:
-        specs.append(['PMS Colors:', str(quote_data['pms_color_count'])])
-    if quote_data['cover_stock']:
-        specs.append(['Cover Stock:', quote_data['cover_stock']])
-    if quote_data['text_stock']:
-        specs.append(['Text Stock:', quote_data['text_stock']])
-    story.append(Table(specs, colWidths=[2*inch, 4*inch]))
-    if quote_data['finishing_options']:
-        story.append(Paragraph("Finishing Options", heading))
-        story.append(Paragraph(", ".join(quote_data['finishing_options']), styles['Normal']))
-    story.append(Paragraph("Delivery Location: " + quote_data['delivery_location'], styles['Normal']))
-    if quote_data['special_requirements']:
-        story.append(Paragraph("Special Requirements: " + quote_data['special_requirements'], styles['Normal']))
-    story.append(Spacer(1, 30))
-    story.append(Paragraph("Total Estimated Cost", heading))
-    story.append(Paragraph(f"<b>${quote_data['estimated_cost']:.2f}</b>", styles['Normal']))
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
-
 @app.post("/api/quotes", response_model=QuoteResponse)
-async def create_quote(quote_request: QuoteRequest):
+def create_quote(quote_request: QuoteRequest, db=Depends(get_db), actor: Actor = Depends(request_actor)):
+    cursor = db.cursor(dictionary=True)
     try:
         quote_id = str(uuid.uuid4())[:8].upper()
         estimated_cost = calculate_quote_cost(quote_request)
-        cursor.execute("""
-            INSERT INTO quotes (
-                quote_id, client_name, product_type, finished_size, page_count, sidedness,
-                cover_stock, text_stock, finishing_options, quantity, delivery_location,
-                special_requirements, ink_type, pms_colors, pms_color_count, estimated_cost,
-                created_at, status
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
+        cursor.execute(queries.INSERT_QUOTE, (
             quote_id, quote_request.client_name, quote_request.product_type,
             quote_request.finished_size, quote_request.page_count, quote_request.sidedness,
             quote_request.cover_stock, quote_request.text_stock,
@@ -184,6 +81,7 @@ async def create_quote(quote_request: QuoteRequest):
             estimated_cost, datetime.utcnow(), "pending"
         ))
         db.commit()
+        audit_log.record(quote_id, "created", "pending", actor)
         return QuoteResponse(quote_id=quote_id, client_name=quote_request.client_name,
             product_type=quote_request.product_type, estimated_cost=estimated_cost,
             created_at=datetime.utcnow(), status="pending")
@@ -192,8 +90,9 @@ async def create_quote(quote_request: QuoteRequest):
         raise HTTPException(status_code=500, detail="DB insert error")
 
 @app.get("/api/quotes/{quote_id}", response_model=QuoteDetail)
-async def get_quote(quote_id: str):
-    cursor.execute("SELECT * FROM quotes WHERE quote_id = %s", (quote_id,))
+def get_quote(quote_id: str, db=Depends(get_db)):
+    cursor = db.cursor(dictionary=True)
+    cursor.execute(queries.SELECT_QUOTE, (quote_id,))
     row = cursor.fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Quote not found")
@@ -201,37 +100,117 @@ async def get_quote(quote_id: str):
     return row
 
 @app.get("/api/quotes", response_model=List[QuoteResponse])
-async def list_quotes():
-    cursor.execute("SELECT quote_id, client_name, product_type, estimated_cost, created_at, status FROM quotes")
+def list_quotes(db=Depends(get_db)):
+    cursor = db.cursor(dictionary=True)
+    cursor.execute(queries.LIST_QUOTES)
     rows = cursor.fetchall()
     return rows
 
 @app.put("/api/quotes/{quote_id}/status")
-async def update_status(quote_id: str, status: str):
-    cursor.execute("UPDATE quotes SET status = %s WHERE quote_id = %s", (status, quote_id))
+def update_status(quote_id: str, status: str, db=Depends(get_db), actor: Actor = Depends(request_actor)):
+    cursor = db.cursor(dictionary=True)
+    cursor.execute(queries.UPDATE_QUOTE_STATUS, (status, quote_id))
     db.commit()
+    if cursor.rowcount:
+        audit_log.record(quote_id, "status_changed", status, actor)
     return {"message": "Status updated"}
 
 @app.delete("/api/quotes/{quote_id}")
-async def delete_quote(quote_id: str):
-    cursor.execute("DELETE FROM quotes WHERE quote_id = %s", (quote_id,))
+def delete_quote(quote_id: str, db=Depends(get_db), actor: Actor = Depends(request_actor)):
+    cursor = db.cursor(dictionary=True)
+    cursor.execute(queries.DELETE_QUOTE, (quote_id,))
     db.commit()
+    if cursor.rowcount:
+        audit_log.record(quote_id, "deleted", None, actor)
     return {"message": "Quote deleted"}
 
+@app.get("/api/quotes/{quote_id}/history", response_model=List[QuoteEvent])
+def quote_history(quote_id: str, db=Depends(get_db)):
+    cursor = db.cursor(dictionary=True)
+    cursor.execute(queries.SELECT_QUOTE_HISTORY, (quote_id,))
+    rows = cursor.fetchall()
+    # Events still waiting in this worker's buffer are newer than anything flushed
+    rows.extend(dict(zip(EVENT_FIELDS, event))
+                for event in audit_log.pending_for(quote_id))
+    return rows
+
+def fetch_quote(pool, quote_id):
+    with db_connection(pool) as db:
+        cursor = db.cursor(dictionary=True)
+        cursor.execute(queries.SELECT_QUOTE, (quote_id,))
+        return cursor.fetchone()
+
 @app.get("/api/quotes/{quote_id}/export")
-async def export_quote_pdf(quote_id: str):
-    cursor.execute("SELECT * FROM quotes WHERE quote_id = %s", (quote_id,))
-    row = cursor.fetchone()
+async def export_quote_pdf(quote_id: str, request: Request, _=Depends(rate_limit(export_rate_limiter))):
+    # Return the connection before queueing for a render slot so waiting exports don't drain the pool
+    row = await run_in_threadpool(fetch_quote, request.app.state.db_pool, quote_id)
     if not row:
         raise HTTPException(status_code=404, detail="Quote not found")
     row["finishing_options"] = row["finishing_options"].split(",") if row["finishing_options"] else []
-    pdf_stream = generate_quote_pdf(row)
+    async with pdf_limiter.slot():
+        pdf_stream = await run_in_threadpool(generate_quote_pdf, row)
     return StreamingResponse(pdf_stream, media_type="application/pdf", headers={"Content-Disposition": f"attachment; filename=quote_{quote_id}.pdf"})
 
+def quotes_not_found(quote_ids):
+    return HTTPException(status_code=404, detail=f"Quotes not found: {', '.join(quote_ids)}")
+
+def missing_quote_ids(pool, quote_ids):
+    with db_connection(pool) as db:
+        cursor = db.cursor(dictionary=True)
+        cursor.execute(queries.existing_quote_ids(len(quote_ids)), tuple(quote_ids))
+        found = {row["quote_id"] for row in cursor.fetchall()}
+    return [quote_id for quote_id in quote_ids if quote_id not in found]
+
+def render_comparison(pool, quote_ids):
+    def quote_chunks(cursor):
+        expected = iter(quote_ids)
+        while True:
+            rows = cursor.fetchmany(COMPARE_COLUMNS_PER_TABLE)
+            for row in rows:
+                # Rows come back in request order, so a gap means a quote was deleted since the check
+                quote_id = next(expected)
+                if row["quote_id"] != quote_id:
+                    raise quotes_not_found([quote_id])
+                row["finishing_options"] = row["finishing_options"].split(",") if row["finishing_options"] else []
+            if not rows:
+                missing = list(expected)
+                if missing:
+                    raise quotes_not_found(missing)
+                return
+            yield rows
+    with db_connection(pool) as db:
+        cursor = db.cursor(dictionary=True)
+        # One query, ordered as requested, consumed a table's worth of rows at a time while rendering
+        cursor.execute(queries.compare_quotes(len(quote_ids)), tuple(quote_ids) * 2)
+        return generate_comparison_pdf(quote_chunks(cursor))
+
+@app.post("/api/quotes/compare/pdf")
+async def export_comparison_pdf(compare_request: CompareRequest, request: Request, _=Depends(rate_limit(export_rate_limiter))):
+    quote_ids = compare_request.quote_ids
+    # Cheap primary-key check before queueing for a render slot
+    missing = await run_in_threadpool(missing_quote_ids, request.app.state.db_pool, quote_ids)
+    if missing:
+        raise quotes_not_found(missing)
+    async with pdf_limiter.slot():
+        pdf_stream = await run_in_threadpool(render_comparison, request.app.state.db_pool, quote_ids)
+    return StreamingResponse(pdf_stream, media_type="application/pdf", headers={"Content-Disposition": "attachment; filename=quote_comparison.pdf"})
+
+@app.get("/api/pricing/cache")
+def pricing_cache_stats():
+    return unit_cost_cache.stats()
+
+@app.get("/api/admission")
+def admission_stats():
+    return {"pdf": pdf_limiter.stats()}
+
 @app.get("/api/health")
-def health_check():
+def health_check(request: Request):
+    # Taken inside the try so an unreachable database or a saturated pool reports "fail", not a 5xx
     try:
-        cursor.execute("SELECT 1")
+        with db_connection(request.app.state.db_pool) as db:
+            cursor = db.cursor(dictionary=True)
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
         return {"status": "ok"}
     except Exception as e:
         logger.error(f"Health check failed: {e}")
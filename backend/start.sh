@@ -5,6 +5,10 @@
 echo "Installing Python dependencies..."
 pip install -r requirements.txt
 
+# Bring the schema up to date before any worker checks it
+echo "Applying database migrations..."
+python migrations.py upgrade || exit 1
+
 # Start the server
 echo "Starting ImpactAI Backend..."
-uvicorn server:app --host 0.0.0.0 --port ${PORT:-8001}
\ No newline at end of file
+gunicorn -c gunicorn.conf.py server:app
\ No newline at end of file
@@ -0,0 +1,27 @@
+import os
+import runpy
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+BACKEND = os.path.join(os.path.dirname(__file__), "..", "backend")
+
+# The backend is run from its own directory (`cd backend && uvicorn server:app`), not installed
+sys.path.insert(0, BACKEND)
+
+@pytest.fixture
+def behind_proxy(monkeypatch):
+    """TestClient for `app` wrapped the way UvicornWorker wraps it under gunicorn.conf.py.
+
+    TestClient connects from "testclient", standing in for the load balancer.
+    """
+    def client(app, forwarded_allow_ips=None):
+        if forwarded_allow_ips is None:
+            monkeypatch.delenv("FORWARDED_ALLOW_IPS", raising=False)
+        else:
+            monkeypatch.setenv("FORWARDED_ALLOW_IPS", forwarded_allow_ips)
+        trusted = runpy.run_path(os.path.join(BACKEND, "gunicorn.conf.py"))["forwarded_allow_ips"]
+        return TestClient(ProxyHeadersMiddleware(app, trusted_hosts=trusted))
+    return client
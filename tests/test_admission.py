@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from starlette.requests import Request
+
+import admission
+
+def run(coro):
+    return asyncio.run(coro)
+
+async def occupy(limiter, seconds):
+    async with limiter.slot():
+        await asyncio.sleep(seconds)
+
+def test_limiter_rejects_when_queue_is_full():
+    async def scenario():
+        limiter = admission.ConcurrencyLimiter("test", limit=1, max_queue=1, max_wait=5, retry_after=7)
+        running = asyncio.create_task(occupy(limiter, 0.1))
+        queued = asyncio.create_task(occupy(limiter, 0))
+        await asyncio.sleep(0.01)
+        assert (limiter.active, limiter.waiting) == (1, 1)
+        with pytest.raises(HTTPException) as exc:
+            async with limiter.slot():
+                pass
+        await asyncio.gather(running, queued)
+        return limiter, exc.value
+
+    limiter, error = run(scenario())
+    assert error.status_code == 429
+    assert error.headers["Retry-After"] == "7"
+    assert limiter.stats() == {"limit": 1, "active": 0, "waiting": 0, "max_queue": 1, "rejected": 1}
+
+def test_limiter_rejects_after_waiting_too_long():
+    async def scenario():
+        limiter = admission.ConcurrencyLimiter("test", limit=1, max_queue=4, max_wait=0.02)
+        running = asyncio.create_task(occupy(limiter, 0.2))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as exc:
+            async with limiter.slot():
+                pass
+        await running
+        return limiter, exc.value
+
+    limiter, error = run(scenario())
+    assert error.status_code == 429
+    assert "Retry-After" in error.headers
+    assert (limiter.waiting, limiter.rejected) == (0, 1)
+
+def test_limiter_runs_queued_work_in_turn():
+    async def scenario():
+        limiter = admission.ConcurrencyLimiter("test", limit=2, max_queue=4, max_wait=5)
+        await asyncio.gather(*(occupy(limiter, 0.01) for _ in range(6)))
+        return limiter
+
+    assert run(scenario()).stats()["rejected"] == 0
+
+@pytest.mark.parametrize("kwargs", [
+    dict(limit=0, max_queue=1, max_wait=1),
+    dict(limit=1, max_queue=-1, max_wait=1),
+    dict(limit=1, max_queue=1, max_wait=0),
+])
+def test_limiter_rejects_invalid_config(kwargs):
+    with pytest.raises(ValueError):
+        admission.ConcurrencyLimiter("test", **kwargs)
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission.time, "monotonic", clock)
+    return clock
+
+def test_bucket_allows_burst_then_refills(clock):
+    limiter = admission.RateLimiter(rate=2, burst=3)
+    assert [limiter.acquire("a") for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("a") == pytest.approx(0.5)
+    clock.now += 0.5
+    assert limiter.acquire("a") == 0
+    clock.now += 10
+    assert [limiter.acquire("a") for _ in range(4)][-1] > 0  # refill caps at the burst size
+
+def test_bucket_is_per_client(clock):
+    limiter = admission.RateLimiter(rate=1, burst=1)
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") > 0
+    assert limiter.acquire("b") == 0
+
+def test_bucket_evicts_least_recently_seen_clients(clock):
+    limiter = admission.RateLimiter(rate=1, burst=1, max_clients=2)
+    limiter.acquire("a")
+    limiter.acquire("b")
+    limiter.acquire("a")
+    limiter.acquire("c")  # evicts b, the least recently seen
+    assert set(limiter._buckets) == {"a", "c"}
+    assert limiter.acquire("b") == 0  # b starts over with a full bucket
+
+@pytest.mark.parametrize("kwargs", [dict(rate=0, burst=1), dict(rate=1, burst=0), dict(rate=1, burst=1, max_clients=0)])
+def test_bucket_rejects_invalid_config(kwargs):
+    with pytest.raises(ValueError):
+        admission.RateLimiter(**kwargs)
+
+def test_client_key_ignores_api_key_header():
+    def request(headers):
+        return Request({"type": "http", "headers": headers, "client": ("10.0.0.1", 1234)})
+
+    plain = admission.client_key(request([]))
+    assert plain == "ip:10.0.0.1"
+    assert admission.client_key(request([(b"x-api-key", b"random")])) == plain
+
+def export_app():
+    app = FastAPI()
+    limiter = admission.RateLimiter(rate=1, burst=1)
+
+    @app.get("/export", dependencies=[Depends(admission.rate_limit(limiter))])
+    def export():
+        return {}
+    return app
+
+def test_forwarded_clients_get_separate_buckets(behind_proxy):
+    client = behind_proxy(export_app(), forwarded_allow_ips="*")
+    first = {"X-Forwarded-For": "203.0.113.7"}
+    assert client.get("/export", headers=first).status_code == 200
+    assert client.get("/export", headers=first).status_code == 429
+    assert client.get("/export", headers={"X-Forwarded-For": "198.51.100.2"}).status_code == 200
+
+def test_untrusted_proxy_shares_one_bucket(behind_proxy):
+    client = behind_proxy(export_app())
+    assert client.get("/export", headers={"X-Forwarded-For": "203.0.113.7"}).status_code == 200
+    assert client.get("/export", headers={"X-Forwarded-For": "198.51.100.2"}).status_code == 429
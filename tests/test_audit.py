@@ -0,0 +1,141 @@
+import asyncio
+from contextlib import contextmanager
+
+from fastapi import Depends, FastAPI
+from starlette.requests import Request
+
+import audit
+
+def run(coro):
+    return asyncio.run(coro)
+
+class FakePool:
+    """Stands in for database.ConnectionPool; keeps each executemany batch."""
+
+    def __init__(self):
+        self.batches = []
+        self.failing = False
+
+    @contextmanager
+    def connection(self):
+        if self.failing:
+            raise ConnectionError("database unreachable")
+        yield self
+
+    def cursor(self):
+        return self
+
+    def executemany(self, sql, rows):
+        self.batches.append(list(rows))
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+    def actions(self):
+        return [event[1] for batch in self.batches for event in batch]
+
+def record_many(log, count, prefix="e"):
+    for n in range(count):
+        log.record("Q1", f"{prefix}{n}")
+
+def test_flushes_when_buffer_reaches_flush_size():
+    async def scenario():
+        pool = FakePool()
+        log = audit.AuditLog(flush_size=3, flush_interval=60)
+        log.start(pool)
+        # Handlers record from threadpool threads
+        await asyncio.to_thread(record_many, log, 3)
+        for _ in range(100):
+            if pool.batches:
+                break
+            await asyncio.sleep(0.01)
+        batches = list(pool.batches)
+        await log.stop(pool)
+        return batches
+
+    assert [len(batch) for batch in run(scenario())] == [3]
+
+def test_flushes_on_interval_below_flush_size():
+    async def scenario():
+        pool = FakePool()
+        log = audit.AuditLog(flush_size=100, flush_interval=0.05)
+        log.start(pool)
+        log.record("Q1", "created")
+        await asyncio.sleep(0.3)
+        batches = list(pool.batches)
+        await log.stop(pool)
+        return batches
+
+    assert [len(batch) for batch in run(scenario())] == [1]
+
+def test_failed_flush_requeues_events_in_order():
+    pool = FakePool()
+    log = audit.AuditLog(flush_size=100, flush_interval=60)
+    record_many(log, 2, "old")
+    pool.failing = True
+    assert log.flush(pool) == 0
+    assert len(log.pending_for("Q1")) == 2
+    pool.failing = False
+    log.record("Q1", "new")
+    assert log.flush(pool) == 3
+    assert pool.actions() == ["old0", "old1", "new"]
+    assert log.pending_for("Q1") == []
+
+def test_buffer_keeps_newest_events_past_max_buffer():
+    log = audit.AuditLog(flush_size=100, flush_interval=60, max_buffer=3)
+    record_many(log, 5)
+    assert [event[1] for event in log.pending_for("Q1")] == ["e2", "e3", "e4"]
+    assert log.dropped == 2
+
+def test_requeue_after_failure_respects_max_buffer():
+    pool = FakePool()
+    pool.failing = True
+    log = audit.AuditLog(flush_size=100, flush_interval=60, max_buffer=3)
+    record_many(log, 3, "old")
+    original_connection = pool.connection
+
+    @contextmanager
+    def slow_connection():
+        # Events keep arriving while the failing flush is in flight
+        record_many(log, 2, "new")
+        with original_connection() as db:
+            yield db
+
+    pool.connection = slow_connection
+    assert log.flush(pool) == 0
+    assert [event[1] for event in log.pending_for("Q1")] == ["old2", "new0", "new1"]
+    assert log.dropped == 2
+
+def test_stop_drains_the_buffer():
+    async def scenario():
+        pool = FakePool()
+        log = audit.AuditLog(flush_size=100, flush_interval=60)
+        log.start(pool)
+        record_many(log, 5)
+        await log.stop(pool)
+        return pool, log
+
+    pool, log = run(scenario())
+    assert pool.actions() == [f"e{n}" for n in range(5)]
+    assert log.pending_for("Q1") == []
+
+def test_actor_is_client_ip_with_header_as_hint():
+    request = Request({"type": "http", "headers": [], "client": ("10.0.0.1", 1234)})
+    assert audit.request_actor(request, None) == audit.Actor("10.0.0.1", None)
+    actor = audit.request_actor(request, "  alice  " + "x" * 300)
+    assert actor.ip == "10.0.0.1"
+    assert actor.hint.startswith("alice") and len(actor.hint) == audit.ACTOR_HINT_MAX_LENGTH
+
+def test_actor_behind_proxy_is_the_forwarded_client(behind_proxy):
+    app = FastAPI()
+
+    @app.put("/quotes/{quote_id}")
+    def change(quote_id: str, actor: audit.Actor = Depends(audit.request_actor)):
+        return actor._asdict()
+
+    client = behind_proxy(app, forwarded_allow_ips="*")
+    response = client.put("/quotes/Q1", headers={"X-Forwarded-For": "203.0.113.7", "X-Actor": "alice"})
+    assert response.json() == {"ip": "203.0.113.7", "hint": "alice"}
@@ -0,0 +1,71 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import database
+import server
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self, **kwargs):
+        return SimpleNamespace(execute=lambda sql: None, fetchall=lambda: [(1,)])
+
+    def close(self):
+        self.pool.free += 1
+
+class FakeMySQLPool:
+    """Fails fast when empty, like mysql.connector's MySQLConnectionPool."""
+
+    def __init__(self, pool_name, pool_size, **config):
+        self.free = pool_size
+
+    def get_connection(self):
+        if not self.free:
+            raise AssertionError("pool exhausted; the semaphore should have made the caller wait")
+        self.free -= 1
+        return FakeConnection(self)
+
+@pytest.fixture(autouse=True)
+def fake_mysql_pool(monkeypatch):
+    monkeypatch.setattr(database.pooling, "MySQLConnectionPool", FakeMySQLPool)
+
+def test_callers_wait_for_a_free_connection():
+    pool = database.ConnectionPool(size=2, timeout=5)
+    served = []
+
+    def query():
+        with pool.connection():
+            time.sleep(0.02)
+            served.append(1)
+
+    threads = [threading.Thread(target=query) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(served) == 10
+    assert pool._pool.free == 2
+
+def test_timed_out_wait_is_a_503():
+    pool = database.ConnectionPool(size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(HTTPException) as exc:
+            with pool.connection():
+                pass
+    assert exc.value.status_code == 503
+    with pool.connection():
+        pass
+
+def test_health_check_reports_a_busy_pool_as_fail():
+    pool = database.ConnectionPool(size=1, timeout=0.05)
+    request = Request({"type": "http", "app": SimpleNamespace(state=SimpleNamespace(db_pool=pool))})
+    with pool.connection():
+        result = server.health_check(request)
+    assert result["status"] == "fail"
+    assert server.health_check(request) == {"status": "ok"}
@@ -0,0 +1,72 @@
+import pytest
+
+import migrations
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = None
+
+    def execute(self, sql, params=()):
+        self.db.statements.append(sql)
+        if "information_schema.tables" in sql:
+            self.result = (1,) if self.db.version is not None else None
+        elif "MAX(version)" in sql:
+            self.result = (self.db.version,)
+
+    def fetchone(self):
+        return self.result
+
+    def close(self):
+        pass
+
+class FakeDB:
+    def __init__(self, version):
+        self.version = version
+        self.statements = []
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def ddl(self):
+        return [sql for sql in self.statements if sql.lstrip().upper().startswith(("CREATE", "ALTER", "INSERT"))]
+
+def test_missing_version_table_reads_as_version_zero():
+    db = FakeDB(version=None)
+    assert migrations.current_version(db) == 0
+    assert db.ddl() == []
+
+def test_schema_check_is_read_only():
+    db = FakeDB(version=None)
+    with pytest.raises(RuntimeError, match="version 0"):
+        migrations.check_schema(db)
+    assert db.ddl() == []
+
+def test_schema_check_passes_at_latest_version():
+    db = FakeDB(version=migrations.LATEST_VERSION)
+    migrations.check_schema(db)
+    assert db.ddl() == []
+
+def test_schema_check_rejects_newer_database():
+    with pytest.raises(RuntimeError, match="newer"):
+        migrations.check_schema(FakeDB(version=migrations.LATEST_VERSION + 1))
+
+class IndexCursor:
+    def __init__(self, indexes):
+        self.indexes = set(indexes)
+        self.statements = []
+        self.result = None
+
+    def execute(self, sql, params=()):
+        self.statements.append(sql)
+        if "information_schema.statistics" in sql:
+            self.result = (1,) if params[1] in self.indexes else None
+
+    def fetchone(self):
+        return self.result
+
+def test_unused_quote_indexes_are_dropped_when_present():
+    cursor = IndexCursor({"idx_quotes_created_listing", "idx_quotes_status_created"})
+    migrations._0005_drop_unused_quote_indexes(cursor)
+    drops = [sql for sql in cursor.statements if sql.startswith("DROP")]
+    assert drops == ["DROP INDEX idx_quotes_status_created ON quotes"]
@@ -0,0 +1,11 @@
+import pytest
+from pydantic import ValidationError
+
+from models import CompareRequest
+
+def test_compare_request_dedupes_in_order():
+    assert CompareRequest(quote_ids=["B", "A", "B"]).quote_ids == ["B", "A"]
+
+def test_compare_request_needs_two_distinct_quotes():
+    with pytest.raises(ValidationError):
+        CompareRequest(quote_ids=["A", "A"])
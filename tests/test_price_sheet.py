@@ -0,0 +1,125 @@
+import csv
+
+import pytest
+
+import price_sheet
+from models import QuoteRequest
+from pricing import calculate_quote_cost
+
+SPEC = dict(
+    client_name="Test Print Co", product_type="Brochure", finished_size="A4 (210 × 297mm)", page_count="8",
+    sidedness="double", cover_stock="300gsm Gloss Art", text_stock="150gsm Gloss Art",
+    finishing_options="Matt Laminate; Spot UV", quantity="1000", delivery_location="Metro Melbourne",
+    special_requirements="", ink_type="CMYK", pms_colors="true", pms_color_count="2",
+)
+
+def write_sheet(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(SPEC))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+def read_output(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+def price_sheet_rows(tmp_path, rows, *args):
+    output = tmp_path / "priced.csv"
+    assert price_sheet.main([write_sheet(tmp_path / "specs.csv", rows), "-o", str(output), *args]) == 0
+    return read_output(output)
+
+class Done:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+class InlinePool:
+    """apply_async that runs immediately, so read-ahead is the only variable."""
+
+    def apply_async(self, func, args):
+        return Done(func(*args))
+
+def test_zip_batches_bounds_read_ahead_and_keeps_order():
+    read = []
+    def batches():
+        for n in range(10):
+            read.append(n)
+            yield [{"n": n}]
+
+    seen = []
+    for records, _ in price_sheet.zip_batches(batches(), InlinePool(), window=3):
+        seen.append(records[0]["n"])
+        assert len(read) - len(seen) < 3
+    assert seen == list(range(10))
+
+def test_empty_sheet_still_gets_a_header(tmp_path):
+    source = tmp_path / "specs.csv"
+    source.write_text("client_name,product_type,quantity\n")
+    output = tmp_path / "priced.csv"
+    assert price_sheet.main([str(source), "-o", str(output), "--workers", "1"]) == 0
+    with open(output, newline="") as f:
+        assert list(csv.reader(f)) == [["client_name", "product_type", "quantity", "estimated_cost", "error"]]
+
+def test_valid_row_is_priced_like_the_api(tmp_path):
+    [row] = price_sheet_rows(tmp_path, [SPEC], "--workers", "1")
+    expected = calculate_quote_cost(QuoteRequest(**{
+        **SPEC, "finishing_options": ["Matt Laminate", "Spot UV"], "special_requirements": None}))
+    assert (float(row["estimated_cost"]), row["error"]) == (expected, "")
+    assert row["client_name"] == SPEC["client_name"]
+
+@pytest.mark.parametrize("cell, finishes", [
+    ("Matt Laminate; Spot UV", ["Matt Laminate", "Spot UV"]),
+    ("Matt Laminate,Spot UV", ["Matt Laminate", "Spot UV"]),
+    (" Embossing ;; ", ["Embossing"]),
+    ("", []),
+])
+def test_finishes_split_on_semicolons_and_commas(cell, finishes):
+    assert price_sheet._quote_request({**SPEC, "finishing_options": cell}).finishing_options == finishes
+
+def test_empty_cells_in_nullable_fields_mean_none():
+    assert {"cover_stock", "text_stock", "special_requirements"} <= price_sheet.NULLABLE_FIELDS
+    quote = price_sheet._quote_request({**SPEC, "cover_stock": "", "text_stock": "  "})
+    assert (quote.cover_stock, quote.text_stock, quote.special_requirements) == (None, None, None)
+
+def test_invalid_rows_report_the_field_and_keep_going(tmp_path):
+    rows = price_sheet_rows(tmp_path, [{**SPEC, "page_count": "eight"}, {**SPEC, "client_name": ""}, SPEC],
+                            "--workers", "1")
+    assert [row["estimated_cost"] == "" for row in rows] == [True, True, False]
+    assert rows[0]["error"].startswith("page_count: ")
+    assert rows[1]["error"] == "client_name: Field required"
+    assert rows[2]["error"] == ""
+
+def test_worker_pool_matches_single_process_output(tmp_path):
+    rows = [{**SPEC, "quantity": str(50 + n * 100), "page_count": "x" if n % 4 == 3 else str(n + 1)}
+            for n in range(20)]
+    single = price_sheet_rows(tmp_path, rows, "--workers", "1", "--batch-size", "3")
+    pooled = price_sheet_rows(tmp_path, rows, "--workers", "2", "--batch-size", "3")
+    assert pooled == single
+    assert [row["quantity"] for row in pooled] == [row["quantity"] for row in rows]
+    assert any(row["error"] for row in pooled) and any(row["estimated_cost"] for row in pooled)
+
+def test_xlsx_input_is_priced(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("openpyxl")
+    source = tmp_path / "specs.xlsx"
+    pd.DataFrame([SPEC, {**SPEC, "quantity": "50"}]).to_excel(source, index=False)
+    output = tmp_path / "priced.csv"
+    assert price_sheet.main([str(source), "-o", str(output), "--workers", "1"]) == 0
+    csv_rows = price_sheet_rows(tmp_path, [SPEC, {**SPEC, "quantity": "50"}], "--workers", "1")
+    assert read_output(output) == csv_rows
+
+@pytest.mark.parametrize("name, content, message", [
+    ("specs.csv", "", "is empty"),
+    ("specs.xls", "", ".xls is not supported"),
+    ("specs.csv", "client_name,estimated_cost\nTest,1\n", "already has estimated_cost"),
+])
+def test_unusable_input_fails_cleanly(tmp_path, capsys, name, content, message):
+    source = tmp_path / name
+    source.write_text(content)
+    output = tmp_path / "priced.csv"
+    assert price_sheet.main([str(source), "-o", str(output)]) == 1
+    assert message in capsys.readouterr().err
+    assert not output.exists()
@@ -0,0 +1,136 @@
+import itertools
+import random
+
+import pytest
+
+import pricing
+from models import QuoteRequest
+
+def make_quote(**overrides):
+    data = dict(
+        client_name="Test Print Co", product_type="Brochure", finished_size="A4 (210 × 297mm)",
+        page_count=8, sidedness="double", cover_stock="300gsm Gloss Art", text_stock="150gsm Gloss Art",
+        finishing_options=["Matt Laminate", "Foiling (Other)"], quantity=1000,
+        delivery_location="Metro Melbourne", special_requirements=None, ink_type="CMYK",
+        pms_colors=True, pms_color_count=2,
+    )
+    data.update(overrides)
+    return QuoteRequest(**data)
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    tables = {name: dict(table) for name, table in pricing.RATE_TABLES.items()}
+    pricing.unit_cost_cache.clear()
+    yield
+    pricing.update_rate_tables(**tables)
+
+def test_cache_evicts_least_recently_used():
+    cache = pricing.UnitCostCache(lambda key: key * 2, maxsize=2)
+    cache(1)
+    cache(2)
+    cache(1)  # 2 is now the least recently used
+    cache(3)
+    assert cache.stats()["size"] == 2
+    cache(1)
+    assert cache.stats()["hits"] == 2
+    cache(2)
+    assert cache.stats()["misses"] == 4
+
+def test_cache_hit_ratio():
+    cache = pricing.UnitCostCache(lambda key: key, maxsize=8)
+    for key in (1, 1, 1, 2):
+        cache(key)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (2, 2, 0.5)
+    assert pricing.UnitCostCache(lambda key: key, maxsize=8).stats()["hit_ratio"] == 0.0
+
+def test_quantity_and_delivery_share_a_cache_entry():
+    first = pricing.calculate_quote_cost(make_quote(quantity=100))
+    second = pricing.calculate_quote_cost(make_quote(quantity=5000, delivery_location="Interstate (WA)"))
+    assert first != second
+    assert pricing.unit_cost_cache.stats()["hits"] == 1
+
+def test_finish_order_does_not_change_the_key():
+    a = make_quote(finishing_options=["Spot UV", "Matt Laminate"])
+    b = make_quote(finishing_options=["Matt Laminate", "Spot UV"])
+    assert pricing.spec_key(a) == pricing.spec_key(b)
+    assert pricing.spec_key(a) != pricing.spec_key(make_quote(finishing_options=["Spot UV"]))
+
+def test_update_rate_tables_invalidates_cached_costs():
+    quote = make_quote()
+    before = pricing.calculate_quote_cost(quote)
+    key = pricing.spec_key(quote)
+    pricing.update_rate_tables(base_cost={**pricing.RATE_TABLES['base_cost'], 'Brochure': 3.6})
+    assert pricing.unit_cost_cache.stats()["size"] == 0
+    assert pricing.spec_key(quote) != key
+    assert pricing.calculate_quote_cost(quote) > before
+
+def test_update_rate_tables_rejects_unknown_tables():
+    with pytest.raises(KeyError):
+        pricing.update_rate_tables(paper_cost={})
+
+def test_repeat_specs_are_served_from_the_cache():
+    quote = make_quote()
+    for quantity in (100, 500, 1000, 5000):
+        pricing.calculate_quote_cost(make_quote(quantity=quantity))
+    pricing.calculate_quote_cost(quote)
+    stats = pricing.unit_cost_cache.stats()
+    assert (stats["misses"], stats["hits"], stats["size"]) == (1, 4, 1)
+
+def legacy_quote_cost(q):
+    # calculate_quote_cost before memoization, with finishes summed in request order
+    tables = pricing.RATE_TABLES
+    base_cost = tables['base_cost'].get(q.product_type, 2.0)
+    size_mult = tables['size_mult'].get(q.finished_size.split(' ')[0], 1.0)
+    page_mult = max(1.0, q.page_count * 0.3)
+    sided_mult = 1.6 if q.sidedness == 'double' else 1.0
+    stock_cost = 0.0
+    if q.cover_stock:
+        if '300gsm' in q.cover_stock or '350gsm' in q.cover_stock:
+            stock_cost += 0.3
+        elif '400gsm' in q.cover_stock:
+            stock_cost += 0.5
+    if q.text_stock:
+        if '150gsm' in q.text_stock or '170gsm' in q.text_stock:
+            stock_cost += 0.2
+        elif '200gsm' in q.text_stock or '250gsm' in q.text_stock:
+            stock_cost += 0.35
+    finish_cost = sum(tables['finish_cost'].get(f, 0.0) for f in q.finishing_options)
+    ink_cost = tables['ink_cost'].get(q.ink_type, 0.1)
+    pms_cost = q.pms_color_count * 0.35 if q.pms_colors else 0
+    delivery_cost = tables['delivery_cost'].get(q.delivery_location, 30)
+    discount = 0.15 if q.quantity >= 1000 else 0.1 if q.quantity >= 500 else 0.05 if q.quantity >= 100 else 0.0
+    unit_cost = base_cost * size_mult * page_mult * sided_mult + stock_cost + finish_cost + ink_cost + pms_cost
+    return round(unit_cost * q.quantity * (1 - discount) + delivery_cost, 2)
+
+def random_quotes(count, seed=26):
+    rng = random.Random(seed)
+    tables = pricing.RATE_TABLES
+    for _ in range(count):
+        yield make_quote(
+            product_type=rng.choice(list(tables['base_cost']) + ["Other"]),
+            finished_size=rng.choice(["A4 (210 × 297mm)", "A5", "DL (99 × 210mm)", "Custom size", "B2"]),
+            page_count=rng.randint(1, 120), sidedness=rng.choice(["single", "double"]),
+            cover_stock=rng.choice([None, "300gsm Gloss Art", "400gsm Silk", "90gsm Bond"]),
+            text_stock=rng.choice([None, "150gsm Gloss Art", "250gsm Silk", "80gsm Bond"]),
+            finishing_options=rng.sample(list(tables['finish_cost']) + ["Unknown"], rng.randint(0, 4)),
+            quantity=rng.randint(1, 20000), delivery_location=rng.choice(list(tables['delivery_cost']) + ["Overseas"]),
+            ink_type=rng.choice(["CMYK", "Black Only", "Custom", "Other"]),
+            pms_colors=rng.random() < 0.5, pms_color_count=rng.randint(0, 6),
+        )
+
+def test_prices_match_the_pre_cache_formula():
+    for quote in random_quotes(5000):
+        expected = legacy_quote_cost(quote)
+        if len(quote.finishing_options) > 1:
+            # Finishes are summed order-independently now, which can move a price by a cent
+            assert pricing.calculate_quote_cost(quote) == pytest.approx(expected, abs=0.0100001)
+        else:
+            assert pricing.calculate_quote_cost(quote) == expected
+
+def test_finish_cost_does_not_depend_on_summation_order():
+    # A plain left-to-right sum of these three gives 1.8 or 1.7999999999999998 depending on order
+    spec = pricing.spec_key(make_quote())
+    costs = {pricing._compute_unit_cost(spec[:7] + (order,) + spec[8:])
+             for order in itertools.permutations(["Matt Laminate", "Gloss Laminate", "Foiling (Silver)"])}
+    assert len(costs) == 1
@@ -0,0 +1,99 @@
+"""
+EXPLAIN every query the API issues against a migrated, seeded database and fail
+on full table scans. Needs a MySQL server: set MYSQL_HOST/MYSQL_USER/MYSQL_PASSWORD
+(the user must be able to create databases). Skipped when none is reachable.
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+mysql_connector = pytest.importorskip("mysql.connector")
+
+import database  # noqa: E402
+import migrations  # noqa: E402
+import queries  # noqa: E402
+
+TEST_DATABASE = os.getenv("MYSQL_TEST_DATABASE", "impactai_query_plan_test")
+SEED_ROWS = 5000
+IDS = [f"Q{n:07d}" for n in range(SEED_ROWS)]
+
+# Statement name in queries.py -> (SQL, sample parameters)
+ENDPOINT_QUERIES = {
+    "SELECT_QUOTE": (queries.SELECT_QUOTE, (IDS[42],)),
+    "LIST_QUOTES": (queries.LIST_QUOTES, ()),
+    "UPDATE_QUOTE_STATUS": (queries.UPDATE_QUOTE_STATUS, ("approved", IDS[42])),
+    "DELETE_QUOTE": (queries.DELETE_QUOTE, (IDS[42],)),
+    "compare_quotes": (queries.compare_quotes(3), tuple(IDS[10:13]) * 2),
+    "existing_quote_ids": (queries.existing_quote_ids(3), tuple(IDS[10:13])),
+    "SELECT_QUOTE_HISTORY": (queries.SELECT_QUOTE_HISTORY, (IDS[42],)),
+}
+# Inserts have no access path to check
+UNCHECKED = {"INSERT_QUOTE", "INSERT_QUOTE_EVENT"}
+
+def _seed_rows():
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1)
+    for n, quote_id in enumerate(IDS):
+        yield (
+            quote_id, f"Client {rng.randint(1, 400)}", rng.choice(["Brochure", "Flyer", "Booklet"]),
+            "A4 (210 × 297mm)", rng.randint(1, 48), rng.choice(["single", "double"]),
+            "300gsm Gloss Art", "150gsm Gloss Art", "Matt Laminate", rng.randint(50, 5000),
+            "Metro Melbourne", None, "CMYK", False, 1, round(rng.uniform(50, 5000), 2),
+            start + timedelta(minutes=n * 7), rng.choice(["pending", "approved", "rejected"]),
+        )
+
+def _seed_events():
+    start = datetime(2024, 1, 1)
+    for n, quote_id in enumerate(IDS):
+        yield (quote_id, "created", "pending", "10.0.0.1", "seed", start + timedelta(minutes=n * 7))
+        if n % 3 == 0:
+            yield (quote_id, "status_changed", "approved", "10.0.0.1", None, start + timedelta(minutes=n * 7 + 60))
+
+@pytest.fixture(scope="module")
+def db():
+    try:
+        server = database.connect(database=None)
+    except mysql_connector.Error as e:
+        pytest.skip(f"MySQL not available: {e}")
+    cursor = server.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS {TEST_DATABASE}")
+    cursor.execute(f"CREATE DATABASE {TEST_DATABASE}")
+    server.database = TEST_DATABASE
+    migrations.upgrade(server)
+    cursor.executemany(queries.INSERT_QUOTE, list(_seed_rows()))
+    cursor.executemany(queries.INSERT_QUOTE_EVENT, list(_seed_events()))
+    server.commit()
+    cursor.execute("ANALYZE TABLE quotes, quote_events")
+    cursor.fetchall()
+    cursor.close()
+    yield server
+    cursor = server.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS {TEST_DATABASE}")
+    server.close()
+
+def test_every_api_query_is_checked():
+    statements = {name for name, value in vars(queries).items()
+                  if name.isupper() and isinstance(value, str)}
+    assert statements - UNCHECKED <= set(ENDPOINT_QUERIES)
+    assert "compare_quotes" in ENDPOINT_QUERIES
+
+def test_migrations_reach_latest_version(db):
+    assert migrations.current_version(db) == migrations.LATEST_VERSION
+    assert migrations.upgrade(db) == []
+
+@pytest.mark.parametrize("name", sorted(ENDPOINT_QUERIES))
+def test_query_avoids_full_table_scan(db, name):
+    sql, params = ENDPOINT_QUERIES[name]
+    cursor = db.cursor(dictionary=True, buffered=True)
+    cursor.execute("EXPLAIN " + sql, params)
+    plan = cursor.fetchall()
+    db.rollback()
+    cursor.close()
+    scans = [row for row in plan if row["table"] in ("quotes", "quote_events") and row["type"] == "ALL"]
+    assert not scans, f"{name} does a full table scan: {plan}"
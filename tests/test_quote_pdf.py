@@ -0,0 +1,43 @@
+import pytest
+
+import quote_pdf
+from bench_pdf import SAMPLE_QUOTE
+
+@pytest.fixture
+def logo_path(monkeypatch):
+    def set_path(path):
+        monkeypatch.setattr(quote_pdf, "LETTERHEAD_LOGO_PATH", path)
+        quote_pdf._letterhead_logo.cache_clear()
+    yield set_path
+    quote_pdf._letterhead_logo.cache_clear()
+
+def test_unreadable_logo_is_skipped(logo_path, tmp_path, caplog):
+    bogus = tmp_path / "logo.png"
+    bogus.write_text("not an image")
+    logo_path(str(bogus))
+    assert quote_pdf._letterhead_logo() is None
+    assert "letterhead logo" in caplog.text
+    assert quote_pdf.generate_quote_pdf(SAMPLE_QUOTE).getvalue().startswith(b"%PDF")
+
+def test_missing_logo_path_drops_the_letterhead(logo_path, monkeypatch):
+    monkeypatch.setattr(quote_pdf, "LETTERHEAD_TEXT", "")
+    logo_path("/nonexistent/logo.png")
+    assert not quote_pdf.has_letterhead()
+
+LONG_TEXT = "Deliver to the loading dock at the rear of the building. " * 60
+
+def test_comparison_renders_long_free_text():
+    quote = dict(SAMPLE_QUOTE, special_requirements=LONG_TEXT)
+    pdf = quote_pdf.generate_comparison_pdf([[quote, dict(quote, quote_id="B2DA3B1E")]])
+    assert pdf.getvalue().startswith(b"%PDF")
+
+def test_long_cells_are_truncated_with_a_note():
+    text = quote_pdf.compare_cell_text(LONG_TEXT)
+    assert len(text) < len(LONG_TEXT)
+    assert text.endswith(quote_pdf.COMPARE_TRUNCATED_NOTE)
+    assert quote_pdf.compare_cell_text("Deliver before 9am") == "Deliver before 9am"
+
+def test_rows_taller_than_a_page_split_instead_of_failing(monkeypatch):
+    monkeypatch.setattr(quote_pdf, "COMPARE_CELL_MAX_CHARS", len(LONG_TEXT) * 4)
+    quote = dict(SAMPLE_QUOTE, special_requirements=LONG_TEXT * 4)
+    assert quote_pdf.generate_comparison_pdf([[quote] * 5]).getvalue().startswith(b"%PDF")